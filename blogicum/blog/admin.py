@@ -1,7 +1,54 @@
 from django.contrib import admin
 
-from .models import Category, Location, Post
+from .models import (
+    Category,
+    ImageRendition,
+    Location,
+    MediaBlob,
+    Post,
+    Task,
+)
 
 admin.site.register(Category)
 admin.site.register(Location)
-admin.site.register(Post)
+
+
+class ImageRenditionInline(admin.TabularInline):
+    model = ImageRendition
+    fields = ('width', 'format', 'name')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    inlines = (ImageRenditionInline,)
+    list_display = (
+        'title',
+        'author',
+        'category',
+        'pub_date',
+        'is_published',
+        'comment_count',
+    )
+    list_filter = ('is_published', 'category')
+    list_select_related = ('author', 'category')
+    search_fields = ('title',)
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'args', 'attempts', 'run_after', 'locked_until')
+    list_filter = ('name',)
+    readonly_fields = ('last_error', 'created_at')
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'ref_count')
+    readonly_fields = ('name', 'ref_count')
+    search_fields = ('name',)
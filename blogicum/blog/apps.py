@@ -5,3 +5,10 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from blogicum.db import connect_signals
+
+        from . import signals  # noqa: F401
+
+        connect_signals()
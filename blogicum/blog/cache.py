@@ -0,0 +1,111 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from blogicum.routers import read_from_primary
+
+TAG_KEY = 'blog:tag:{}'
+TAG_CHANGED_KEY = 'blog:tag-changed:{}'
+
+# Теги, которыми помечаются закэшированные данные:
+# posts — набор видимых постов (посты, публикация категорий),
+# comments — любые комментарии (их число выводится в карточках),
+# taxonomy — категории и местоположения,
+# authors — имена пользователей (выводятся в постах и комментариях),
+# post:<pk> — пост и его комментарии, author:<username> — профиль.
+POSTS = 'posts'
+COMMENTS = 'comments'
+TAXONOMY = 'taxonomy'
+AUTHORS = 'authors'
+FEED_TAGS = (POSTS, COMMENTS, TAXONOMY, AUTHORS)
+POST_PAGE_TAGS = (TAXONOMY, AUTHORS)
+
+
+def _new_version():
+    # Начинаем с текущего времени, а не с 1: если ключ вытеснили из кэша,
+    # новая версия не совпадёт с уже закэшированными значениями.
+    return int(time.time() * 1000)
+
+
+def get_tag_versions(tags):
+    keys = [TAG_KEY.format(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_tags_changed_at(tags):
+    """Время последнего сброса любого из тегов для Last-Modified."""
+    keys = [TAG_CHANGED_KEY.format(tag) for tag in tags]
+    changed = cache.get_many(keys)
+    for key in keys:
+        if key not in changed:
+            # Время вытеснили из кэша: считаем, что тег сброшен сейчас.
+            cache.add(key, timezone.now(), None)
+            changed[key] = cache.get(key)
+    return max(changed.values())
+
+
+def invalidate_tags(*tags):
+    for tag in tags:
+        key = TAG_KEY.format(tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
+    now = timezone.now()
+    cache.set_many({TAG_CHANGED_KEY.format(tag): now for tag in tags}, None)
+
+
+def feed_count_key(name):
+    version, = get_tag_versions((POSTS,))
+    return f'blog:feed-count:{version}:{name}'
+
+
+def page_cache_key(request, tags):
+    versions = ':'.join(map(str, get_tag_versions(tags)))
+    url = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'blog:page:{url}:{versions}'
+
+
+def cache_anonymous_page(*tags):
+    """Кэширует страницу для анонимных посетителей.
+
+    Теги могут ссылаться на аргументы представления: 'post:{pk}'.
+    Авторизованные пользователи всегда получают свежую страницу с
+    кнопками редактирования и формой комментария.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+
+            key = page_cache_key(
+                request, [tag.format(**kwargs) for tag in tags]
+            )
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            # Страница попадёт в кэш под новой версией тегов: читаем с
+            # основной БД, иначе отстающая реплика закэширует её старой.
+            with read_from_primary():
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render') and callable(response.render):
+                    response.render()
+            if response.status_code == 200:
+                cache.set(key, response, settings.ANONYMOUS_PAGE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,92 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.views.decorators.http import condition
+
+from blogicum.routers import read_from_primary
+
+from .cache import POST_PAGE_TAGS, get_tag_versions, get_tags_changed_at
+from .models import Post
+
+POST_MODIFIED_KEY = 'blog:post-modified:{}:{}:{}:{}:{}'
+
+
+def make_etag(request, *parts):
+    # Авторизованным пользователям показываются кнопки редактирования и
+    # форма комментария, поэтому ETag зависит и от пользователя.
+    raw = ':'.join(map(str, (*parts, request.user.pk)))
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+
+def load_visible_post(request, pk):
+    """Пост с автором, категорией и местоположением или None.
+
+    Результат запоминается на время запроса: валидаторы и представление
+    обходятся одним запросом к БД.
+    """
+    posts = request.__dict__.setdefault('_visible_posts', {})
+    if pk not in posts:
+        posts[pk] = (
+            Post.objects.with_relations()
+            .visible_to(request.user)
+            .filter(pk=pk)
+            .first()
+        )
+    return posts[pk]
+
+
+def get_post_updated_at(request, pk):
+    # Видимость поста зависит от него самого, категории и пользователя:
+    # сохранение поста и комментариев меняет версию тега post:<pk>,
+    # категорий и местоположений — версию TAXONOMY, имён пользователей —
+    # AUTHORS. Недоступный пост не кэшируется и валидаторов не получает.
+    versions = get_tag_versions((f'post:{pk}', *POST_PAGE_TAGS))
+    key = POST_MODIFIED_KEY.format(pk, *versions, request.user.pk)
+    updated_at = cache.get(key)
+    if updated_at is None:
+        # Реплика может отставать: дата с неё пережила бы новую версию.
+        with read_from_primary():
+            post = load_visible_post(request, pk)
+        if post is None:
+            return None
+        updated_at = post.updated_at
+        cache.set(key, updated_at, settings.ANONYMOUS_PAGE_CACHE_TIMEOUT)
+    return updated_at
+
+
+def post_etag(request, pk, **kwargs):
+    updated_at = get_post_updated_at(request, pk)
+    if updated_at is None:
+        return None
+    return make_etag(
+        request, updated_at.isoformat(), *get_tag_versions(POST_PAGE_TAGS)
+    )
+
+
+def post_last_modified(request, pk, **kwargs):
+    # На странице есть категория, местоположение и имя автора: их
+    # изменения не трогают updated_at, но тоже меняют страницу.
+    updated_at = get_post_updated_at(request, pk)
+    if updated_at is None:
+        return None
+    return max(updated_at, get_tags_changed_at(POST_PAGE_TAGS))
+
+
+def feed_condition(*tags):
+    """Условный GET для ленты: ETag без рендера и без запросов к БД.
+
+    Записи постов, комментариев, категорий и профилей меняют версии
+    тегов, отложенные посты сбрасывает команда publish_scheduled.
+    """
+    def etag(request, **kwargs):
+        return make_etag(
+            request,
+            *get_tag_versions([tag.format(**kwargs) for tag in tags]),
+        )
+    return condition(etag_func=etag)
+
+
+post_condition = condition(
+    etag_func=post_etag, last_modified_func=post_last_modified
+)
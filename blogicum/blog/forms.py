@@ -1,15 +1,70 @@
 from django import forms
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
 
 from .models import Comments, Post
 
 User = get_user_model()
 
 
+def read_image_size(data):
+    # Image.open() читает только заголовок файла: пиксели не декодируются.
+    if hasattr(data, 'temporary_file_path'):
+        source = data.temporary_file_path()
+    else:
+        source = data
+    try:
+        with Image.open(source) as image:
+            return image.size
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    finally:
+        if hasattr(data, 'seek'):
+            data.seek(0)
+
+
+class PostImageField(forms.ImageField):
+    """Изображение с ограничением размера файла и числа пикселей.
+
+    Ограничения проверяются до полной проверки Pillow, которая читает
+    весь файл.
+    """
+
+    def to_python(self, data):
+        if data in self.empty_values:
+            return super().to_python(data)
+        max_bytes = settings.POST_IMAGE_MAX_BYTES
+        if data.size > max_bytes:
+            raise ValidationError(
+                'Файл слишком большой: максимум %(limit)s.',
+                code='file_too_large',
+                params={'limit': filesizeformat(max_bytes)},
+            )
+        size = read_image_size(data)
+        if size is None:
+            raise ValidationError(
+                self.error_messages['invalid_image'], code='invalid_image'
+            )
+        width, height = size
+        max_pixels = settings.POST_IMAGE_MAX_PIXELS
+        if width * height > max_pixels:
+            raise ValidationError(
+                'Изображение слишком большое: максимум %(limit)s '
+                'мегапикселей.',
+                code='too_many_pixels',
+                params={'limit': max_pixels // 1_000_000},
+            )
+        return super().to_python(data)
+
+
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ('author', 'is_published')
+        field_classes = {'image': PostImageField}
         widgets = {
             'pub_date': forms.DateTimeInput(
                 format='%Y-%m-%d %H:%M:%S',
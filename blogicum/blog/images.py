@@ -0,0 +1,167 @@
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from .cache import POSTS, invalidate_tags
+from .models import ImageRendition, Post
+from .tasks import enqueue, task
+
+# Ширины копий Post.image: карточки и страница поста занимают до 40rem,
+# 1280 — для экранов с двойной плотностью пикселей.
+RENDITION_WIDTHS = (320, 640, 960, 1280)
+RENDITIONS_DIR = 'renditions'
+EXTENSIONS = {ImageRendition.JPEG: 'jpg'}
+SAVE_OPTIONS = {
+    ImageRendition.JPEG: {'quality': 85, 'optimize': True},
+    ImageRendition.WEBP: {'quality': 80, 'method': 6},
+    ImageRendition.AVIF: {'quality': 60},
+}
+
+# AVIF поддерживается не всеми сборками Pillow, а старые версии не знают
+# такого модуля и на features.check() выдают предупреждение.
+HAS_AVIF = 'avif' in features.get_supported()
+
+
+def get_formats():
+    formats = [ImageRendition.JPEG, ImageRendition.WEBP]
+    if HAS_AVIF:
+        formats.append(ImageRendition.AVIF)
+    return formats
+
+
+def get_widths(source_width):
+    # Копии не увеличивают изображение: узкий исходник даёт одну копию
+    # в своём размере.
+    widths = [width for width in RENDITION_WIDTHS if width < source_width]
+    if len(widths) < len(RENDITION_WIDTHS):
+        widths.append(min(source_width, RENDITION_WIDTHS[-1]))
+    return widths
+
+
+def rendition_prefix(image_name):
+    directory, filename = posixpath.split(image_name)
+    return posixpath.join(directory, RENDITIONS_DIR, f'{filename}.')
+
+
+def renditions_are_current(post):
+    sources = [rendition.source for rendition in post.renditions.all()]
+    if not post.image:
+        return not sources
+    return bool(sources) and all(
+        source == post.image.name for source in sources
+    )
+
+
+def open_image(field_file):
+    with field_file.open('rb') as file:
+        image = Image.open(file)
+        # Файлы из админки и старые загрузки не проходили проверку формы.
+        if image.width * image.height > settings.POST_IMAGE_MAX_PIXELS:
+            raise ValueError('Слишком много пикселей.')
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.load()
+    return image
+
+
+def encode(source, width, image_format):
+    image = source.copy()
+    image.thumbnail((width, source.height), Image.LANCZOS)
+    output = BytesIO()
+    image.save(output, image_format.upper(), **SAVE_OPTIONS[image_format])
+    return ContentFile(output.getvalue())
+
+
+def make_renditions(post):
+    """Создаёт копии изображения поста по ширинам и форматам.
+
+    Возвращает несохранённые ImageRendition. Если исходник не читается,
+    копии не создаются: шаблоны показывают оригинал.
+    """
+    if not post.image:
+        return []
+    try:
+        source = open_image(post.image)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return []
+
+    # Копии пишутся обычным хранилищем: их имена уже выводятся из имени
+    # исходника.
+    storage = default_storage
+    prefix = rendition_prefix(post.image.name)
+    renditions = []
+    for width in get_widths(source.width):
+        for image_format in get_formats():
+            extension = EXTENSIONS.get(image_format, image_format)
+            name = f'{prefix}{width}w.{extension}'
+            storage.delete(name)
+            renditions.append(ImageRendition(
+                post=post,
+                width=width,
+                format=image_format,
+                name=storage.save(name, encode(source, width, image_format)),
+                source=post.image.name,
+            ))
+    return renditions
+
+
+def schedule_renditions(post):
+    """Убирает копии прежнего изображения и ставит в очередь новые.
+
+    Пока задача не выполнена, шаблоны показывают оригинал.
+    """
+    if renditions_are_current(post):
+        return
+    # Файлы копий общие для постов с одним изображением: их удаляет
+    # blog.media.collect() вместе с исходником.
+    post.renditions.all().delete()
+    if post.image and not copy_shared_renditions(post):
+        enqueue('process_post_image', post.pk)
+
+
+def copy_shared_renditions(post):
+    """Переиспользует копии того же файла, созданные для другого поста."""
+    shared = ImageRendition.objects.filter(
+        source=post.image.name
+    ).exclude(post=post)
+    source_post_id = shared.values_list('post_id', flat=True).first()
+    if source_post_id is None:
+        return []
+    return ImageRendition.objects.bulk_create(
+        ImageRendition(
+            post=post,
+            width=rendition.width,
+            format=rendition.format,
+            name=rendition.name,
+            source=rendition.source,
+        )
+        for rendition in shared.filter(post_id=source_post_id)
+    )
+
+
+@task
+def process_post_image(post_id):
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is not None:
+        update_renditions(post)
+
+
+def update_renditions(post, force=False):
+    """Пересоздаёт копии, если изображение поста сменилось."""
+    if not force and renditions_are_current(post):
+        return False
+    deleted, _ = post.renditions.all().delete()
+    renditions = ImageRendition.objects.bulk_create(make_renditions(post))
+    if not (deleted or renditions):
+        return False
+    # update() не вызывает сигналы и не перезаписывает остальные поля,
+    # поэтому теги кэша сбрасываются здесь же.
+    type(post).objects.filter(pk=post.pk).update(updated_at=timezone.now())
+    invalidate_tags(POSTS, f'post:{post.pk}')
+    return True
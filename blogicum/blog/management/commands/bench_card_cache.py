@@ -0,0 +1,49 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from blog.views import IndexListView
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендера главной ленты с пустым и прогретым '
+        'кэшем карточек публикаций.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=50,
+            help='Сколько раз отрендерить ленту в каждом режиме.',
+        )
+
+    def handle(self, *args, **options):
+        view = IndexListView.as_view()
+        factory = RequestFactory()
+
+        def render():
+            request = factory.get('/')
+            request.user = AnonymousUser()
+            return view(request).render()
+
+        repeat = options['repeat']
+        cold = 0
+        for _ in range(repeat):
+            cache.clear()
+            started = time.perf_counter()
+            render()
+            cold += time.perf_counter() - started
+
+        render()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            render()
+        warm = time.perf_counter() - started
+
+        self.stdout.write(f'Без кэша:  {cold / repeat * 1000:.2f} мс')
+        self.stdout.write(f'С кэшем:   {warm / repeat * 1000:.2f} мс')
@@ -0,0 +1,128 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from blog.models import Category, Comments, Post
+from blog.views import POSTS_ON_PAGE
+
+User = get_user_model()
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает планы и время запросов лент. Запустите с '
+        '--without-indexes и без него, чтобы сравнить планы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Сколько тестовых публикаций создать перед замером.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Сколько раз выполнить каждый запрос.',
+        )
+        parser.add_argument(
+            '--without-indexes',
+            action='store_true',
+            help=(
+                'Замерить без индексов лент: они удаляются в транзакции, '
+                'которая затем откатывается.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(options['seed'])
+
+        post = Post.objects.order_by('-comment_count').first()
+        if post is None:
+            self.stderr.write('Нет публикаций: запустите с --seed N.')
+            return
+
+        if not options['without_indexes']:
+            self.measure(post, options['repeat'])
+            return
+        # Откат миграций до 0005 не подходит: запросы лент используют
+        # поля, добавленные позже (excerpt, is_live, updated_at).
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for model in (Post, Comments):
+                    for index in model._meta.indexes:
+                        cursor.execute(f'DROP INDEX IF EXISTS {index.name}')
+            self.measure(post, options['repeat'])
+            transaction.set_rollback(True)
+
+    def measure(self, post, repeat):
+        queries = {
+            'index': Post.objects.published().for_feed(),
+            'profile': Post.objects.published().for_feed().filter(
+                author_id=post.author_id
+            ),
+            'category': Post.objects.published().for_feed().filter(
+                category_id=post.category_id
+            ),
+            'comments': Comments.objects.filter(post=post),
+        }
+        self.stdout.write(f'Бэкенд: {connection.vendor}')
+        for name, queryset in queries.items():
+            queryset = queryset[:POSTS_ON_PAGE]
+            started = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset)
+            elapsed = (time.perf_counter() - started) / repeat
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{name}: {elapsed * 1000:.2f} мс'
+            ))
+            self.stdout.write(queryset.explain())
+
+    def seed(self, total):
+        author, _ = User.objects.get_or_create(username='bench_author')
+        categories = [
+            Category.objects.get_or_create(
+                slug=f'bench-{index}',
+                defaults={'title': f'Bench {index}', 'description': '-'},
+            )[0]
+            for index in range(10)
+        ]
+        now = timezone.now()
+        posts = [
+            Post(
+                title=f'Bench post {index}',
+                text='Lorem ipsum ' * 50,
+                pub_date=now - timedelta(minutes=random.randint(
+                    -60 * 24 * 30, 60 * 24 * 365 * 5
+                )),
+                author=author,
+                category=random.choice(categories),
+                is_published=random.random() > 0.05,
+            )
+            for index in range(total)
+        ]
+        # bulk_create() не вызывает save(): флаг is_live выставляем сами.
+        for post in posts:
+            post.is_live = post.pub_date <= now
+        Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)
+        post = Post.objects.order_by('-pk').first()
+        Comments.objects.bulk_create(
+            (
+                Comments(text='Bench comment', post=post, author=author)
+                for _ in range(min(total, BATCH_SIZE))
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        Post.objects.filter(pk=post.pk).update(
+            comment_count=post.comments.count()
+        )
+        self.stdout.write(f'Создано публикаций: {total}')
@@ -0,0 +1,114 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test import override_settings
+
+from blog.models import Comments, Post
+from blog.views import POSTS_ON_PAGE
+
+User = get_user_model()
+
+# Режим SQLite по умолчанию: журнал отката и полная синхронизация.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет пропускную способность SQLite при одновременном чтении '
+        'главной ленты и записи комментариев: без настройки и с '
+        'SQLITE_TUNED_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=5,
+            help='Длительность каждого замера.',
+        )
+        parser.add_argument(
+            '--readers',
+            type=int,
+            default=4,
+            help='Число потоков, читающих ленту.',
+        )
+        parser.add_argument(
+            '--writers',
+            type=int,
+            default=2,
+            help='Число потоков, добавляющих комментарии.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Замер имеет смысл только для SQLite.')
+        post = Post.objects.published().first()
+        if post is None:
+            raise CommandError(
+                'Нет опубликованных постов: запустите bench_feeds --seed N.'
+            )
+        author, _ = User.objects.get_or_create(username='bench_author')
+
+        for title, pragmas in (
+            ('По умолчанию', DEFAULT_PRAGMAS),
+            ('С настройкой', settings.SQLITE_TUNED_PRAGMAS),
+        ):
+            connections.close_all()
+            with override_settings(SQLITE_PRAGMAS=pragmas):
+                reads, writes, errors = self.measure(post, author, options)
+            seconds = options['seconds']
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            self.stdout.write(
+                f'  чтений/с: {reads / seconds:.0f}, '
+                f'записей/с: {writes / seconds:.0f}, '
+                f'ошибок блокировки: {errors}'
+            )
+        connections.close_all()
+
+    def measure(self, post, author, options):
+        stop = threading.Event()
+        counters = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+
+        def worker(name, operation):
+            try:
+                while not stop.is_set():
+                    try:
+                        operation()
+                    except OperationalError:
+                        outcome = 'errors'
+                    else:
+                        outcome = name
+                    with lock:
+                        counters[outcome] += 1
+            finally:
+                connection.close()
+
+        def read():
+            list(Post.objects.published().for_feed()[:POSTS_ON_PAGE])
+
+        def write():
+            Comments.objects.create(post=post, author=author, text='bench')
+
+        threads = [
+            threading.Thread(target=worker, args=('reads', read))
+            for _ in range(options['readers'])
+        ] + [
+            threading.Thread(target=worker, args=('writes', write))
+            for _ in range(options['writers'])
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['seconds'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        Comments.objects.filter(author=author, text='bench').delete()
+        return counters['reads'], counters['writes'], counters['errors']
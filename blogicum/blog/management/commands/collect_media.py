@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog import media
+from blog.models import MediaBlob, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает ссылки постов на файлы изображений и удаляет '
+        'файлы без ссылок вместе с их копиями.'
+    )
+
+    def handle(self, *args, **options):
+        names = Post.objects.exclude(image='').values_list('image', flat=True)
+        MediaBlob.objects.bulk_create(
+            (MediaBlob(name=name) for name in names.distinct()),
+            ignore_conflicts=True,
+        )
+        MediaBlob.objects.update(ref_count=Coalesce(
+            Subquery(
+                Post.objects.filter(image=OuterRef('name'))
+                .order_by()
+                .values('image')
+                .annotate(total=Count('pk'))
+                .values('total')
+            ),
+            0,
+        ))
+        orphans = MediaBlob.objects.filter(ref_count=0).values_list(
+            'name', flat=True
+        )
+        collected = sum(media.collect(name) for name in list(orphans))
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено файлов без ссылок: {collected}')
+        )
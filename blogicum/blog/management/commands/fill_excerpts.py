@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post, make_excerpt
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Заполняет анонсы публикаций, сохранённых до появления поля.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересчитать анонсы всех публикаций, а не только пустые.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.only('text', 'excerpt').order_by('pk')
+        if not options['all']:
+            posts = posts.filter(excerpt='')
+
+        batch = []
+        updated = 0
+        for post in posts.iterator(chunk_size=BATCH_SIZE):
+            post.excerpt = make_excerpt(post.text)
+            batch.append(post)
+            if len(batch) == BATCH_SIZE:
+                Post.objects.bulk_update(batch, ('excerpt',))
+                updated += len(batch)
+                batch = []
+        if batch:
+            Post.objects.bulk_update(batch, ('excerpt',))
+            updated += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'Обновлено анонсов: {updated}'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import update_renditions
+from blog.models import Post
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт уменьшенные копии изображений публикаций, загруженных до '
+        'появления копий.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересоздать копии всех изображений.',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only('image').order_by('pk')
+        updated = sum(
+            update_renditions(post, force=options['all'])
+            for post in posts.iterator(chunk_size=BATCH_SIZE)
+        )
+        self.stdout.write(self.style.SUCCESS(f'Обновлено постов: {updated}'))
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.cache import POSTS, invalidate_tags
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Публикует отложенные посты, дата публикации которых наступила, '
+        'и сбрасывает кэш лент. Запускайте по расписанию (cron) или '
+        'постоянно с --interval.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Повторять проверку каждые N секунд; 0 — один раз.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            published = self.publish_due()
+            if published:
+                self.stdout.write(f'Опубликовано постов: {published}')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def publish_due(self):
+        # queryset.update() не вызывает сигналы, поэтому теги кэша
+        # сбрасываются здесь же.
+        due = list(Post.objects.due().values_list('pk', flat=True))
+        if not due:
+            return 0
+        published = Post.objects.filter(pk__in=due, is_live=False).update(
+            is_live=True, updated_at=timezone.now()
+        )
+        invalidate_tags(POSTS, *(f'post:{pk}' for pk in due))
+        return published
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает денормализованные счётчики комментариев постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только показать посты с расхождением, ничего не меняя.',
+        )
+
+    def handle(self, *args, **options):
+        drifted = Post.objects.with_comment_count().exclude(
+            comment_count=F('actual_comment_count')
+        )
+
+        if options['check']:
+            for post in drifted.only('pk', 'comment_count'):
+                self.stdout.write(
+                    f'Пост {post.pk}: {post.comment_count} '
+                    f'!= {post.actual_comment_count}'
+                )
+            self.stdout.write(f'Расхождений: {drifted.count()}')
+            return
+
+        updated = Post.objects.filter(
+            pk__in=drifted.values('pk')
+        ).update(comment_count=Post.objects.comment_count_q())
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {updated}')
+        )
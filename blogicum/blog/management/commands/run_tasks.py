@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.tasks import run_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из таблицы blog_task (обработка '
+        'изображений). Запускайте отдельным процессом рядом с сайтом.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=1,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            done, failed = run_pending()
+            if done or failed:
+                self.stdout.write(
+                    f'Выполнено задач: {done}, с ошибкой: {failed}'
+                )
+            if options['once']:
+                return
+            time.sleep(options['sleep'])
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blogicum.warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Компилирует все шаблоны из templates/: проверяет их синтаксис и '
+        'прогревает кэш cached-загрузчика.'
+    )
+
+    def handle(self, *args, **options):
+        names = warm_templates()
+        self.stdout.write(
+            self.style.SUCCESS(f'Скомпилировано шаблонов: {len(names)}')
+        )
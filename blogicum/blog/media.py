@@ -0,0 +1,64 @@
+import posixpath
+from functools import partial
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+
+from .images import RENDITIONS_DIR, rendition_prefix
+from .models import MediaBlob, Post
+
+
+def lock(name):
+    """Блокирует запись файла до конца текущей транзакции.
+
+    Её же берёт collect(): файл, который переиспользует ещё не
+    зафиксированная загрузка, не удаляется у неё из-под ног.
+    """
+    with transaction.atomic():
+        MediaBlob.objects.get_or_create(name=name)
+        MediaBlob.objects.select_for_update().filter(name=name).exists()
+
+
+def acquire(name):
+    MediaBlob.objects.get_or_create(name=name)
+    MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+
+
+def release(name):
+    MediaBlob.objects.filter(name=name, ref_count__gt=0).update(
+        ref_count=F('ref_count') - 1
+    )
+    # Файлы удаляются только после фиксации транзакции: при откате
+    # пост со ссылкой на файл останется.
+    transaction.on_commit(partial(collect, name))
+
+
+def collect(name):
+    """Удаляет файл и его копии, если на него больше нет ссылок."""
+    # Счётчик мог разойтись с таблицей постов (ручные правки, сбои):
+    # перед удалением файла проверяем ссылки по самой таблице.
+    with transaction.atomic():
+        blob = (
+            MediaBlob.objects.select_for_update()
+            .filter(name=name, ref_count=0)
+            .first()
+        )
+        if blob is None or Post.objects.filter(image=name).exists():
+            return False
+        blob.delete()
+        delete_files(name)
+    return True
+
+
+def delete_files(name):
+    Post._meta.get_field('image').storage.delete(name)
+    directory = posixpath.join(posixpath.dirname(name), RENDITIONS_DIR)
+    prefix = posixpath.basename(rendition_prefix(name))
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+    for filename in files:
+        if filename.startswith(prefix):
+            default_storage.delete(posixpath.join(directory, filename))
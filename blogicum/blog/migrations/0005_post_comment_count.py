@@ -0,0 +1,50 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Comments = apps.get_model('blog', 'Comments')
+    Post.objects.update(
+        comment_count=Coalesce(
+            Subquery(
+                Comments.objects.filter(post=OuterRef('pk'))
+                .order_by()
+                .values('post')
+                .annotate(total=Count('pk'))
+                .values('total')
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0004_comments'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comments',
+            options={'ordering': ('created_at',), 'verbose_name': 'комментарий', 'verbose_name_plural': 'Комментарии'},
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.AlterField(
+            model_name='comments',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
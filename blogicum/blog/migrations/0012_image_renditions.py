@@ -0,0 +1,52 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:38
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def delete_legacy_renditions(apps, schema_editor):
+    # Копии thumbnail и medium из 0011 заменяет ImageRendition; файлы
+    # удаляются здесь, пока их имена ещё хранятся в image_renditions.
+    Post = apps.get_model('blog', 'Post')
+    for renditions in Post.objects.exclude(
+        image_renditions={}
+    ).values_list('image_renditions', flat=True).iterator():
+        for name in renditions.values():
+            default_storage.delete(name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_image_renditions'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_legacy_renditions, migrations.RunPython.noop
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='image_renditions',
+        ),
+        migrations.CreateModel(
+            name='ImageRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('width', models.PositiveSmallIntegerField(verbose_name='Ширина')),
+                ('format', models.CharField(choices=[('jpeg', 'JPEG'), ('webp', 'WebP'), ('avif', 'AVIF')], max_length=4, verbose_name='Формат')),
+                ('name', models.CharField(max_length=255, verbose_name='Файл')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'копия изображения',
+                'verbose_name_plural': 'Копии изображений',
+                'ordering': ('width',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='imagerendition',
+            constraint=models.UniqueConstraint(fields=('post', 'width', 'format'), name='unique_post_rendition'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:43
+
+import blog.storage
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_references(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    MediaBlob = apps.get_model('blog', 'MediaBlob')
+    MediaBlob.objects.bulk_create(
+        MediaBlob(name=row['image'], ref_count=row['total'])
+        for row in Post.objects.exclude(image='')
+        .order_by()
+        .values('image')
+        .annotate(total=Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Файл')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Ссылок')),
+            ],
+            options={
+                'verbose_name': 'файл изображения',
+                'verbose_name_plural': 'Файлы изображений',
+            },
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, storage=blog.storage.ContentAddressedStorage(), upload_to='blog_images', verbose_name='Фото'),
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 20:50
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_media_blob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Изменено'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+# Только для PostgreSQL; на SQLite миграция ничего не делает.
+FORWARD_SQL = (
+    # 0010 пересоздала индекс главной ленты с условием is_live и без
+    # INCLUDE из 0009. Возвращаем покрывающий вариант под тем же именем;
+    # прежний отдельный покрывающий индекс, если он остался, не нужен.
+    'DROP INDEX IF EXISTS post_published_feed_cover_idx',
+    'DROP INDEX IF EXISTS post_published_feed_idx',
+    'CREATE INDEX post_published_feed_idx '
+    'ON blog_post (pub_date DESC, id DESC) '
+    'INCLUDE (category_id, author_id) WHERE is_published AND is_live',
+)
+BACKWARD_SQL = (
+    'DROP INDEX IF EXISTS post_published_feed_idx',
+    'CREATE INDEX post_published_feed_idx '
+    'ON blog_post (pub_date DESC, id DESC) WHERE is_published AND is_live',
+)
+
+
+def run_on_postgresql(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_updated_at_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_postgresql(FORWARD_SQL),
+            run_on_postgresql(BACKWARD_SQL),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.16 on 2026-10-18 22:10
+
+import posixpath
+
+from django.db import migrations, models
+import blog.storage
+
+
+def fill_source(apps, schema_editor):
+    # Копии с именем из другого исходника остаются без source: их
+    # пересоздаст make_renditions.
+    ImageRendition = apps.get_model('blog', 'ImageRendition')
+    renditions = ImageRendition.objects.exclude(post__image='').values_list(
+        'pk', 'name', 'post__image'
+    )
+    for pk, name, image in renditions.iterator():
+        directory, filename = posixpath.split(image)
+        prefix = posixpath.join(directory, 'renditions', f'{filename}.')
+        if name.startswith(prefix):
+            ImageRendition.objects.filter(pk=pk).update(source=image)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_postgres_live_feed_cover'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, db_index=True, storage=blog.storage.ContentAddressedStorage(), upload_to='blog_images', verbose_name='Фото'),
+        ),
+        migrations.AddField(
+            model_name='imagerendition',
+            name='source',
+            field=models.CharField(db_index=True, default='', max_length=255, verbose_name='Исходный файл'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_source, migrations.RunPython.noop),
+    ]
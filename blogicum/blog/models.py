@@ -1,9 +1,18 @@
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from .storage import ContentAddressedStorage
 
 User = get_user_model()
 MAX_TITLE_LENGTH = MAX_NAME_LENGTH = 256
 MAX_LENGTH = 20
+EXCERPT_WORDS = 10
+MAX_EXCERPT_LENGTH = 512
 
 
 class BaseModel(models.Model):
@@ -62,16 +71,103 @@ class Category(BaseModel):
         )
 
 
+def make_excerpt(text):
+    return Truncator(
+        Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+    ).chars(MAX_EXCERPT_LENGTH)
+
+
+class PostQuerySet(models.QuerySet):
+    CARD_FIELDS = (
+        'title',
+        'excerpt',
+        'pub_date',
+        'image',
+        'is_published',
+        'comment_count',
+        'updated_at',
+        'author__username',
+        'category__slug',
+        'category__title',
+        'category__is_published',
+        'location__name',
+        'location__is_published',
+    )
+
+    def published(self):
+        return self.filter(self.published_q())
+
+    def visible_to(self, user):
+        condition = self.published_q()
+        if user.is_authenticated:
+            condition |= Q(author=user)
+        return self.filter(condition)
+
+    def with_relations(self):
+        return self.select_related(
+            'location', 'category', 'author'
+        ).prefetch_related('renditions')
+
+    def as_cards(self):
+        return self.only(*self.CARD_FIELDS)
+
+    def for_feed(self):
+        return self.with_relations().as_cards().order_by('-pub_date')
+
+    def with_comment_count(self):
+        # Ленты читают сохранённый счётчик comment_count; точное число
+        # комментариев нужно для сверки и исправления расхождений.
+        return self.annotate(actual_comment_count=self.comment_count_q())
+
+    @staticmethod
+    def comment_count_q():
+        return Coalesce(
+            Subquery(
+                Comments.objects.filter(post=OuterRef('pk'))
+                .order_by()
+                .values('post')
+                .annotate(total=Count('pk'))
+                .values('total')
+            ),
+            0,
+        )
+
+    def due(self):
+        return self.filter(is_live=False, pub_date__lte=timezone.now())
+
+    @staticmethod
+    def published_q():
+        # Наступление pub_date отражает флаг is_live, который выставляют
+        # save() и команда publish_scheduled: условие не зависит от
+        # текущего времени и целиком проверяется по индексу.
+        return Q(
+            is_published=True,
+            is_live=True,
+            category__is_published=True,
+        )
+
+
 class Post(BaseModel):
     title = models.CharField(
         max_length=MAX_TITLE_LENGTH, verbose_name='Заголовок'
     )
     text = models.TextField(verbose_name='Текст')
+    excerpt = models.CharField(
+        max_length=MAX_EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Анонс',
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text='Если установить дату и время в будущем'
         ' — можно делать отложенные публикации.',
     )
+    is_live = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Дата публикации наступила',
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -96,13 +192,51 @@ class Post(BaseModel):
     image = models.ImageField(
         verbose_name='Фото',
         upload_to='blog_images',
+        storage=ContentAddressedStorage(),
         blank=True,
+        # Ссылки на файл проверяет blog.media.collect().
+        db_index=True,
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
     )
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name='Изменено',
+    )
+
+    objects = PostQuerySet.as_manager()
+
+    loaded_image_name = ''
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_published_feed_idx',
+                condition=Q(is_published=True, is_live=True),
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_feed_idx',
+                condition=Q(is_published=True, is_live=True),
+            ),
+            models.Index(
+                fields=('pub_date',),
+                name='post_scheduled_idx',
+                condition=Q(is_live=False),
+            ),
+        )
 
     def __str__(self):
         return (
@@ -111,6 +245,76 @@ class Post(BaseModel):
             else self.title
         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Имя загруженного файла нужно, чтобы при смене изображения
+        # освободить ссылку на прежний файл (см. MediaBlob).
+        instance = super().from_db(db, field_names, values)
+        if 'image' in field_names:
+            instance.loaded_image_name = instance.image.name
+        return instance
+
+    def get_srcset(self, image_format):
+        # Копии берутся из prefetch_related('renditions'), URL строится
+        # по имени файла без обращения к файловой системе.
+        return ', '.join(
+            f'{default_storage.url(rendition.name)} {rendition.width}w'
+            for rendition in self.renditions.all()
+            if rendition.format == image_format
+        )
+
+    @property
+    def image_sources(self):
+        """Пары (MIME-тип, srcset) для тегов <source>."""
+        sources = []
+        for image_format in ImageRendition.MODERN_FORMATS:
+            srcset = self.get_srcset(image_format)
+            if srcset:
+                sources.append((f'image/{image_format}', srcset))
+        return sources
+
+    @property
+    def image_srcset(self):
+        return self.get_srcset(ImageRendition.JPEG)
+
+    @property
+    def image_src(self):
+        # Для браузеров без srcset и пока копии не готовы — оригинал.
+        jpegs = [
+            rendition for rendition in self.renditions.all()
+            if rendition.format == ImageRendition.JPEG
+        ]
+        if not jpegs:
+            return self.image.url
+        fitting = [
+            rendition for rendition in jpegs
+            if rendition.width <= ImageRendition.FALLBACK_WIDTH
+        ]
+        return default_storage.url((fitting or jpegs)[-1].name)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.excerpt = make_excerpt(self.text)
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        if update_fields is None or 'pub_date' in update_fields:
+            self.is_live = self.pub_date <= timezone.now()
+        if update_fields is not None and 'pub_date' in update_fields:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'is_live'}
+        # Не auto_now: при загрузке фикстур (raw) pre_save не вызывается,
+        # и поле осталось бы пустым; default заполняет его и там.
+        self.updated_at = timezone.now()
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *kwargs['update_fields'], 'updated_at'
+            }
+        # Загрузка файла и ссылка на него из count_image_references
+        # попадают в одну транзакцию: пока она не зафиксирована,
+        # blog.media.collect() не удалит переиспользованный файл.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comments(models.Model):
     text = models.TextField('Текст комментария')
@@ -130,6 +334,12 @@ class Comments(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comments_post_created_idx',
+            ),
+        )
 
     def __str__(self):
         return (
@@ -137,3 +347,106 @@ class Comments(models.Model):
             if len(self.text) > MAX_LENGTH
             else self.text
         )
+
+
+class ImageRendition(models.Model):
+    JPEG = 'jpeg'
+    WEBP = 'webp'
+    AVIF = 'avif'
+    FORMAT_CHOICES = (
+        (JPEG, 'JPEG'),
+        (WEBP, 'WebP'),
+        (AVIF, 'AVIF'),
+    )
+    # Форматы, которые отдаются через <source> только поддерживающим их
+    # браузерам; JPEG остаётся в <img> для остальных.
+    MODERN_FORMATS = (AVIF, WEBP)
+    # Ширина карточки поста (40rem).
+    FALLBACK_WIDTH = 640
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='renditions',
+        verbose_name='Публикация',
+    )
+    width = models.PositiveSmallIntegerField(verbose_name='Ширина')
+    format = models.CharField(
+        max_length=4, choices=FORMAT_CHOICES, verbose_name='Формат'
+    )
+    name = models.CharField(max_length=255, verbose_name='Файл')
+    # Копии одного файла общие для всех постов с ним: их ищут по точному
+    # совпадению имени исходника.
+    source = models.CharField(
+        max_length=255, db_index=True, verbose_name='Исходный файл'
+    )
+
+    class Meta:
+        verbose_name = 'копия изображения'
+        verbose_name_plural = 'Копии изображений'
+        ordering = ('width',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('post', 'width', 'format'),
+                name='unique_post_rendition',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.width}w {self.format}'
+
+
+class Task(models.Model):
+    """Фоновая задача; выполняет команда run_tasks.
+
+    Выполненные задачи удаляются, упавшие повторяются с задержкой до
+    blog.tasks.MAX_ATTEMPTS раз и остаются в таблице с текстом ошибки.
+    """
+
+    name = models.CharField(max_length=100, verbose_name='Задача')
+    args = models.JSONField(default=list, verbose_name='Аргументы')
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток'
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now, verbose_name='Выполнить после'
+    )
+    locked_until = models.DateTimeField(
+        null=True, blank=True, verbose_name='Занята до'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after', 'pk')
+        indexes = (
+            models.Index(
+                fields=('run_after', 'id'), name='task_queue_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name}{tuple(self.args)}'
+
+
+class MediaBlob(models.Model):
+    """Файл изображения и число постов, которые на него ссылаются.
+
+    Файл и его копии удаляются, когда на него не остаётся ссылок.
+    """
+
+    name = models.CharField(max_length=255, unique=True, verbose_name='Файл')
+    ref_count = models.PositiveIntegerField(
+        default=0, verbose_name='Ссылок'
+    )
+
+    class Meta:
+        verbose_name = 'файл изображения'
+        verbose_name_plural = 'Файлы изображений'
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,197 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .cache import feed_count_key
+
+CURSOR_PARAM = 'cursor'
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(value, pk, reverse=False):
+    payload = json.dumps(
+        {'d': value.isoformat(), 'i': pk, 'r': int(reverse)},
+        separators=(',', ':'),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = parse_datetime(payload['d'])
+        pk = int(payload['i'])
+        reverse = bool(payload.get('r'))
+    except (
+        binascii.Error, ValueError, TypeError, KeyError, AttributeError
+    ):
+        raise InvalidCursor(cursor)
+    if value is None:
+        raise InvalidCursor(cursor)
+    return value, pk, reverse
+
+
+class CursorPage:
+    """Страница, выбранная по ключу (дата, id)."""
+
+    is_cursor_page = True
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация: глубокие страницы стоят столько же, сколько первая.
+
+    Вместо OFFSET и COUNT(*) выбирается per_page + 1 запись после
+    (или перед) позиции из курсора по упорядочению (field, id).
+    """
+
+    def __init__(self, queryset, per_page, field='pub_date', descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def get_page(self, cursor):
+        try:
+            position = decode_cursor(cursor) if cursor else None
+        except InvalidCursor:
+            position = None
+
+        if position is None:
+            return self._forward_page(self.queryset, from_cursor=False)
+
+        value, pk, reverse = position
+        if reverse:
+            return self._backward_page(self._seek(value, pk, forward=False))
+        return self._forward_page(
+            self._seek(value, pk, forward=True), from_cursor=True
+        )
+
+    def _seek(self, value, pk, forward):
+        lookup = 'lt' if forward == self.descending else 'gt'
+        return self.queryset.filter(
+            Q(**{f'{self.field}__{lookup}': value})
+            | Q(**{self.field: value, f'pk__{lookup}': pk})
+        )
+
+    def _ordering(self, forward):
+        prefix = '-' if forward == self.descending else ''
+        return f'{prefix}{self.field}', f'{prefix}pk'
+
+    def _forward_page(self, queryset, from_cursor):
+        rows = list(
+            queryset.order_by(*self._ordering(True))[:self.per_page + 1]
+        )
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return CursorPage(
+            rows,
+            next_cursor=self._cursor(rows[-1]) if has_next else None,
+            previous_cursor=(
+                self._cursor(rows[0], reverse=True)
+                if from_cursor and rows else None
+            ),
+        )
+
+    def _backward_page(self, queryset):
+        rows = list(
+            queryset.order_by(*self._ordering(False))[:self.per_page + 1]
+        )
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        return CursorPage(
+            rows,
+            next_cursor=self._cursor(rows[-1]) if rows else None,
+            previous_cursor=(
+                self._cursor(rows[0], reverse=True) if has_previous else None
+            ),
+        )
+
+    def _cursor(self, obj, reverse=False):
+        return encode_cursor(
+            getattr(obj, self.field), obj.pk, reverse=reverse
+        )
+
+
+def estimate_count(queryset):
+    """Оценка числа строк планировщиком PostgreSQL (None, если недоступна)."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который кэширует общее число записей ленты.
+
+    Кэш сбрасывается сменой версии лент при записи постов и категорий.
+    На больших таблицах PostgreSQL вместо COUNT(*) берётся оценка
+    планировщика.
+    """
+
+    def __init__(self, object_list, per_page, cache_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return super().count
+        key = feed_count_key(self.cache_key)
+        count = cache.get(key)
+        if count is None:
+            count = estimate_count(self.object_list)
+            if count is None or count < settings.FEED_COUNT_ESTIMATE_FROM:
+                count = super().count
+            cache.set(key, count, settings.FEED_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def page(self, number):
+        # Закэшированное или оценочное число записей может отставать от
+        # данных (в том числе на реплике), поэтому страница не обрезается
+        # по count: оно влияет только на ссылки пагинатора.
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom:bottom + self.per_page], number, self
+        )
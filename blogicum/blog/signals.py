@@ -0,0 +1,119 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import AUTHORS, COMMENTS, POSTS, TAXONOMY, invalidate_tags
+from . import media
+from .images import schedule_renditions
+from .models import Category, Comments, Location, Post
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Comments)
+def update_post_on_comment_save(sender, instance, created, **kwargs):
+    if kwargs.get('raw'):
+        return
+    posts = Post.objects.filter(pk=instance.post_id)
+    if created:
+        posts.update(
+            comment_count=F('comment_count') + 1,
+            updated_at=timezone.now(),
+        )
+    else:
+        posts.update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Comments)
+def update_post_on_comment_delete(sender, instance, **kwargs):
+    Post.objects.filter(
+        pk=instance.post_id, comment_count__gt=0
+    ).update(
+        comment_count=F('comment_count') - 1,
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(pre_save, sender=Post)
+def set_post_is_live(sender, instance, raw, **kwargs):
+    # loaddata сохраняет объекты в обход Post.save(). Посты из
+    # bulk_create() и update() без is_live опубликует publish_scheduled.
+    if raw:
+        instance.is_live = instance.pub_date <= timezone.now()
+
+
+@receiver(post_save, sender=Post)
+def update_post_renditions(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        schedule_renditions(instance)
+
+
+@receiver(post_save, sender=Post)
+def count_image_references(sender, instance, **kwargs):
+    name = instance.image.name or ''
+    if name == instance.loaded_image_name:
+        return
+    if name:
+        media.acquire(name)
+    if instance.loaded_image_name:
+        media.release(instance.loaded_image_name)
+    instance.loaded_image_name = name
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    # Копии изображения общие для постов с одинаковым файлом, их
+    # удаляет media.collect() вместе с самим файлом.
+    if instance.image.name:
+        media.release(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    invalidate_tags(POSTS, f'post:{instance.pk}')
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def invalidate_comment(sender, instance, **kwargs):
+    invalidate_tags(COMMENTS, f'post:{instance.post_id}')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category(sender, **kwargs):
+    invalidate_tags(POSTS, TAXONOMY)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location(sender, **kwargs):
+    invalidate_tags(TAXONOMY)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, raw, **kwargs):
+    # Профиль по старому адресу и страницы с прежним именем нужно
+    # сбросить после сохранения.
+    instance.loaded_username = None
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    if not raw and instance.pk is not None:
+        instance.loaded_username = (
+            User.objects.filter(pk=instance.pk)
+            .values_list('username', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author(sender, instance, **kwargs):
+    invalidate_tags(f'author:{instance.username}')
+    old_username = getattr(instance, 'loaded_username', None)
+    if old_username and old_username != instance.username:
+        invalidate_tags(f'author:{old_username}', POSTS, COMMENTS, AUTHORS)
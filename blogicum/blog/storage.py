@@ -0,0 +1,42 @@
+import hashlib
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит файл под именем из SHA-256 содержимого.
+
+    Повторная загрузка того же файла не создаёт копию, а возвращает имя
+    уже сохранённого: blog_images/ab/abcdef….jpg. Ссылки постов на файлы
+    считает blog.models.MediaBlob.
+    """
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        hexdigest = digest.hexdigest()
+        return posixpath.join(
+            directory, hexdigest[:2], f'{hexdigest}{extension}'
+        )
+
+    def _save(self, name, content):
+        from .media import lock
+
+        hashed = self.hashed_name(name, content)
+        # Блокировка держится до конца транзакции Post.save(), в которой
+        # пост возьмёт ссылку на файл.
+        lock(hashed)
+        if self.exists(hashed):
+            return hashed
+        saved = super()._save(hashed, content)
+        if saved != hashed:
+            # Тот же файл одновременно загрузили в другом запросе.
+            self.delete(saved)
+        return hashed
@@ -0,0 +1,91 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+# Столько задача считается занятой исполнителем; если он упал, по
+# истечении срока задачу заберёт другой.
+LOCK_TIMEOUT = timedelta(minutes=10)
+RETRY_DELAY = timedelta(seconds=30)
+
+TASKS = {}
+
+
+def task(func):
+    """Регистрирует функцию как фоновую задачу под её именем."""
+    TASKS[func.__name__] = func
+    return func
+
+
+def pending_q(now):
+    # Задача ждёт исполнителя: её никто не держит и попытки не кончились.
+    return (
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    ) & Q(attempts__lt=MAX_ATTEMPTS)
+
+
+def enqueue(name, *args):
+    # Задача пишется в той же транзакции, что и данные: исполнитель
+    # увидит её только после фиксации, а при откате её не будет вовсе.
+    if name not in TASKS:
+        raise ValueError(f'Неизвестная задача: {name}')
+    # Задачи читают данные при запуске, поэтому вторая такая же задача
+    # в очереди ничего не добавит. Уже взятая исполнителем могла
+    # прочитать старые данные, её не учитываем.
+    args = list(args)
+    queued = Task.objects.filter(
+        pending_q(timezone.now()), name=name, args=args
+    ).first()
+    if queued is not None:
+        return queued
+    return Task.objects.create(name=name, args=args)
+
+
+def claim_task():
+    now = timezone.now()
+    with transaction.atomic():
+        task = (
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(pending_q(now), run_after__lte=now)
+            .first()
+        )
+        if task is not None:
+            task.attempts += 1
+            task.locked_until = now + LOCK_TIMEOUT
+            task.save(update_fields=('attempts', 'locked_until'))
+    return task
+
+
+def run_task(task):
+    try:
+        TASKS[task.name](*task.args)
+    except Exception:
+        logger.exception('Задача %s не выполнена', task)
+        task.last_error = traceback.format_exc()
+        task.locked_until = None
+        task.run_after = timezone.now() + RETRY_DELAY * 2 ** task.attempts
+        task.save(update_fields=('last_error', 'locked_until', 'run_after'))
+        return False
+    task.delete()
+    return True
+
+
+def run_pending():
+    """Выполняет все готовые задачи; возвращает (успешных, упавших)."""
+    done = failed = 0
+    while True:
+        task = claim_task()
+        if task is None:
+            return done, failed
+        if run_task(task):
+            done += 1
+        else:
+            failed += 1
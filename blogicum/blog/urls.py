@@ -14,6 +14,11 @@ post_urls = [
         name='delete_post',
     ),
     path('<int:pk>/comment/', views.add_comment, name='add_comment'),
+    path(
+        '<int:pk>/comments/',
+        views.post_comments,
+        name='post_comments',
+    ),
     path(
         '<int:pk>/edit_comment/<int:comment_pk>/',
         views.CommentUpdateView.as_view(),
@@ -1,67 +1,122 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Paginator
-from django.db.models import Count
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy, reverse
-from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 
+from blog.cache import FEED_TAGS, POST_PAGE_TAGS, cache_anonymous_page
+from blog.conditional import (
+    feed_condition,
+    load_visible_post,
+    post_condition,
+)
 from blog.forms import CommentsForm, PostForm, UserForm
 from blog.models import Category, Comments, Post
+from blog.paginators import (
+    CURSOR_PARAM,
+    CachedCountPaginator,
+    CursorPaginator,
+)
 
 POSTS_ON_PAGE = 10
+COMMENTS_ON_PAGE = 50
+PAGES_ON_EACH_SIDE = 2
+PAGES_ON_ENDS = 1
 
 User = get_user_model()
 
 
-def get_post_base(filtering=False, annotate=False):
-    post = Post.objects.select_related(
-        'location',
-        'category',
-        'author',
+def use_cursor_pagination(request):
+    return (
+        settings.FEED_PAGINATION == 'cursor'
+        or CURSOR_PARAM in request.GET
     )
 
-    if filtering:
-        post = post.filter(
-            is_published=True,
-            pub_date__lte=timezone.now(),
-            category__is_published=True,
+
+def get_feed_page(request, queryset, count_key, per_page=POSTS_ON_PAGE):
+    if use_cursor_pagination(request):
+        return CursorPaginator(queryset, per_page).get_page(
+            request.GET.get(CURSOR_PARAM)
         )
+    return CachedCountPaginator(
+        queryset, per_page, cache_key=count_key
+    ).get_page(request.GET.get('page'))
 
-    if annotate:
-        post = post.annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
 
-    return post
+def get_page_range(page_obj):
+    if getattr(page_obj, 'is_cursor_page', False):
+        return None
+    return list(page_obj.paginator.get_elided_page_range(
+        page_obj.number,
+        on_each_side=PAGES_ON_EACH_SIDE,
+        on_ends=PAGES_ON_ENDS,
+    ))
+
+
+class FeedPaginationMixin:
+    paginate_by = POSTS_ON_PAGE
+    paginator_class = CachedCountPaginator
+    count_key = None
 
+    def get_count_key(self):
+        return self.count_key
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, cache_key=self.get_count_key(), **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not use_cursor_pagination(self.request):
+            return super().paginate_queryset(queryset, page_size)
+        page = get_feed_page(
+            self.request, queryset, self.get_count_key(), page_size
+        )
+        return None, page, page.object_list, page.has_other_pages()
 
-class IndexListView(ListView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['page_range'] = get_page_range(context['page_obj'])
+        return context
+
+
+@method_decorator(feed_condition(*FEED_TAGS), name='dispatch')
+@method_decorator(cache_anonymous_page(*FEED_TAGS), name='dispatch')
+class IndexListView(FeedPaginationMixin, ListView):
     model = Post
     template_name = 'blog/index.html'
-    ordering = '-pub_date'
-    paginate_by = POSTS_ON_PAGE
-    queryset = get_post_base(filtering=True, annotate=True)
+    count_key = 'index'
+
+    def get_queryset(self):
+        return Post.objects.published().for_feed()
 
 
-class ProfileListView(ListView):
+@method_decorator(
+    feed_condition(*FEED_TAGS, 'author:{username}'), name='dispatch'
+)
+@method_decorator(
+    cache_anonymous_page(*FEED_TAGS, 'author:{username}'), name='dispatch'
+)
+class ProfileListView(FeedPaginationMixin, ListView):
     template_name = 'blog/profile.html'
-    paginate_by = POSTS_ON_PAGE
 
     def get_queryset(self):
         username = self.kwargs.get('username')
         self.profile = get_object_or_404(User, username=username)
-        if self.profile == self.request.user:
-            queryset = get_post_base(annotate=True)
-        else:
-            queryset = get_post_base(filtering=True, annotate=True)
-        queryset = queryset.filter(author=self.profile)
+        queryset = Post.objects.for_feed().filter(author=self.profile)
+        if self.profile != self.request.user:
+            queryset = queryset.published()
         return queryset
 
+    def get_count_key(self):
+        is_owner = self.profile == self.request.user
+        return f'profile:{self.profile.pk}:{int(is_owner)}'
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.profile
@@ -83,35 +138,50 @@ class ProfileEditUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-def post_detail(request, pk):
-    template = 'blog/detail.html'
-    post = get_object_or_404(
-        Post,
-        pk=pk,
-    )
+def get_visible_post(request, pk):
+    post = load_visible_post(request, pk)
+    if post is None:
+        raise Http404('Публикация не найдена.')
+    return post
 
-    is_post_hidden = not post.is_published
-    is_category_hidden = not post.category.is_published
-    is_post_in_future = post.pub_date > timezone.now()
 
-    if post.author != request.user and any(
-        [
-            is_post_hidden,
-            is_category_hidden,
-            is_post_in_future,
-        ]
-    ):
-        raise Http404()
+def get_comments_page(request, post):
+    comments = post.comments.select_related('author').only(
+        'text', 'created_at', 'post', 'author__username'
+    )
+    return CursorPaginator(
+        comments, COMMENTS_ON_PAGE, field='created_at', descending=False
+    ).get_page(request.GET.get(CURSOR_PARAM))
+
 
+@post_condition
+@cache_anonymous_page('post:{pk}', *POST_PAGE_TAGS)
+def post_detail(request, pk):
+    template = 'blog/detail.html'
+    post = get_visible_post(request, pk)
     form = CommentsForm(request.POST or None)
     context = {
         'post': post,
         'form': form,
-        'comments': post.comments.all(),
+        'comments': get_comments_page(request, post),
+    }
+    return render(request, template, context)
+
+
+@post_condition
+@cache_anonymous_page('post:{pk}', *POST_PAGE_TAGS)
+def post_comments(request, pk):
+    template = 'includes/comment_list.html'
+    post = get_visible_post(request, pk)
+    context = {
+        'post': post,
+        'comments': get_comments_page(request, post),
     }
     return render(request, template, context)
 
 
+@feed_condition(*FEED_TAGS)
+@cache_anonymous_page(*FEED_TAGS)
 def category_posts(request, category_slug):
     template = 'blog/category.html'
     category = get_object_or_404(
@@ -119,16 +189,12 @@ def category_posts(request, category_slug):
         slug=category_slug,
         is_published=True,
     )
-    posts = get_post_base(
-        filtering=True,
-        annotate=True
-    ).filter(category=category)
-    paginator = Paginator(posts, POSTS_ON_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    posts = Post.objects.published().for_feed().filter(category=category)
+    page_obj = get_feed_page(request, posts, f'category:{category.pk}')
     context = {
         'category': category,
         'page_obj': page_obj,
+        'page_range': get_page_range(page_obj),
     }
     return render(request, template, context)
 
@@ -182,7 +248,7 @@ class DeletePostView(PostMixinView, DeleteView):
 @login_required
 def add_comment(request, pk):
     post = get_object_or_404(
-        get_post_base(filtering=True, annotate=True),
+        Post.objects.published(),
         pk=pk)
     form = CommentsForm(request.POST)
     if form.is_valid():
@@ -2,6 +2,10 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from blogicum.warmup import warm_up
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_asgi_application()
+
+warm_up()
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+def close_unusable_connections(**kwargs):
+    # Постоянное соединение (CONN_MAX_AGE) могло оборваться между
+    # запросами: проверяем его до начала запроса, а не падаем на первом
+    # же запросе к БД.
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
+
+
+def enable_health_checks():
+    if getattr(settings, 'CONN_HEALTH_CHECKS', False):
+        request_started.connect(
+            close_unusable_connections,
+            dispatch_uid='blogicum.db.close_unusable_connections',
+        )
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None) or {}
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def connect_signals():
+    """Подключает обработчики соединений; вызывается из BlogConfig.ready()."""
+    connection_created.connect(
+        apply_sqlite_pragmas,
+        dispatch_uid='blogicum.db.apply_sqlite_pragmas',
+    )
+    enable_health_checks()
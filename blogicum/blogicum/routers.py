@@ -0,0 +1,83 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY_DB = 'default'
+STICKY_COOKIE = 'primary_until'
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+@contextmanager
+def read_from_replica():
+    token = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Отправляет чтение на реплики, запись — на основную БД.
+
+    На реплики уходит только чтение внутри read_from_replica(): его
+    включает PrimaryStickinessMiddleware для читающих запросов, кроме
+    REPLICA_STICKY_SECONDS после изменяющего запроса того же клиента,
+    чтобы автор сразу видел свои изменения, даже если реплика отстаёт.
+    Команды и фоновые задачи всегда работают с основной БД.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and _read_from_replica.get():
+            return random.choice(replicas)
+        return PRIMARY_DB
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class PrimaryStickinessMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        is_write = request.method not in ('GET', 'HEAD', 'OPTIONS')
+        if not (is_write or self.is_sticky(request)):
+            with read_from_replica():
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if is_write:
+            sticky_seconds = settings.REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(int(time.time()) + sticky_seconds),
+                max_age=sticky_seconds,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    @staticmethod
+    def is_sticky(request):
+        try:
+            until = int(request.COOKIES.get(STICKY_COOKIE, 0))
+        except ValueError:
+            return False
+        return until > time.time()
@@ -0,0 +1,8 @@
+import os
+
+# Профиль настроек выбирается переменной окружения DJANGO_ENV:
+# development (по умолчанию) или production.
+if os.getenv('DJANGO_ENV', 'development') == 'production':
+    from .production import *  # noqa: F401, F403
+else:
+    from .development import *  # noqa: F401, F403
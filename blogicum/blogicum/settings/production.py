@@ -0,0 +1,56 @@
+import os
+
+from .base import *  # noqa: F401, F403
+from .base import BASE_DIR, DATABASES, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+ALLOWED_HOSTS = os.getenv('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = int(os.getenv('DJANGO_CONN_MAX_AGE', 600))
+
+# Проверять постоянные соединения перед каждым запросом (blogicum/db.py).
+CONN_HEALTH_CHECKS = True
+
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    (
+        'django.template.loaders.cached.Loader',
+        [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ],
+    ),
+]
+
+# Скомпилировать шаблоны из templates/ при старте процесса, до первых
+# запросов (см. blogicum/warmup.py).
+TEMPLATES_WARMUP = True
+
+if os.getenv('MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['MEMCACHED_LOCATION'].split(','),
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv(
+                'DJANGO_CACHE_DIR', '/var/tmp/django_cache'
+            ),
+        },
+    }
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+STATIC_ROOT = BASE_DIR / 'static'
+
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+)
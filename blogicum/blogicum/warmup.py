@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.template import engines
+
+
+def iter_template_names():
+    engine = engines['django'].engine
+    for directory in engine.dirs:
+        for path in sorted(directory.rglob('*.html')):
+            yield path.relative_to(directory).as_posix()
+
+
+def warm_templates():
+    """Загружает (и с cached-загрузчиком — кэширует) шаблоны проекта."""
+    engine = engines['django'].engine
+    names = list(iter_template_names())
+    for name in names:
+        engine.get_template(name)
+    return names
+
+
+def warm_up():
+    if getattr(settings, 'TEMPLATES_WARMUP', False):
+        warm_templates()
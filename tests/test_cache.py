@@ -0,0 +1,172 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Comments
+
+
+@pytest.mark.django_db
+def test_post_card_cache_follows_post_and_comment_writes(
+    mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert 'Комментарии (0)' in user_client.get('/').content.decode()
+
+    mixer.blend(Comments, post=post)
+    assert 'Комментарии (1)' in user_client.get('/').content.decode(), (
+        'Убедитесь, что карточка поста в ленте обновляется после '
+        'добавления комментария.'
+    )
+
+    post.title = 'Новый заголовок карточки'
+    post.save()
+    assert post.title in user_client.get('/').content.decode(), (
+        'Убедитесь, что карточка поста в ленте обновляется после '
+        'редактирования поста.'
+    )
+
+    post.category.title = 'Новое название категории'
+    post.category.save()
+    assert post.category.title in user_client.get('/').content.decode()
+
+
+@pytest.mark.django_db
+def test_anonymous_pages_are_cached_until_related_writes(
+    mixer, user_client, unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in ('/', f'/posts/{post.id}/'):
+        unlogged_client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = unlogged_client.get(url)
+        assert response.status_code == 200
+        assert not queries.captured_queries, (
+            f'Убедитесь, что страница `{url}` для анонимных посетителей '
+            'отдаётся из кэша.'
+        )
+
+    comment = mixer.blend(Comments, post=post, text='Свежий комментарий')
+    assert comment.text in unlogged_client.get(
+        f'/posts/{post.id}/'
+    ).content.decode(), (
+        'Убедитесь, что кэш страницы поста сбрасывается при добавлении '
+        'комментария.'
+    )
+    assert 'Комментарии (1)' in unlogged_client.get('/').content.decode()
+
+    content = user_client.get(f'/posts/{post.id}/').content.decode()
+    assert f'/posts/{post.id}/edit/' in content, (
+        'Убедитесь, что авторизованные пользователи не получают страницу '
+        'из кэша анонимных посетителей.'
+    )
+
+
+@pytest.mark.django_db
+def test_conditional_get_returns_not_modified_until_writes(
+    mixer, unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in ('/', f'/posts/{post.id}/'):
+        etag = unlogged_client.get(url)['ETag']
+        response = unlogged_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Убедитесь, что страница `{url}` отвечает 304, если она не '
+            'изменилась.'
+        )
+
+        mixer.blend(Comments, post=post)
+        response = unlogged_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f'Убедитесь, что ETag страницы `{url}` меняется после '
+            'добавления комментария.'
+        )
+
+    response = unlogged_client.get(f'/posts/{post.id}/')
+    assert response.has_header('Last-Modified')
+
+
+@pytest.mark.django_db
+def test_cached_comments_hide_after_category_unpublished(
+    unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/comments/'
+    assert unlogged_client.get(url).status_code == 200
+
+    post.category.is_published = False
+    post.category.save()
+    assert unlogged_client.get(url).status_code == 404, (
+        'Убедитесь, что комментарии поста из снятой с публикации категории '
+        'не отдаются из кэша.'
+    )
+
+
+@pytest.mark.django_db
+def test_not_modified_is_not_returned_for_hidden_post(
+    unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    last_modified = unlogged_client.get(url)['Last-Modified']
+
+    post.category.is_published = False
+    post.category.save()
+    response = unlogged_client.get(
+        url, HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+    assert response.status_code == 404, (
+        'Убедитесь, что пост из снятой с публикации категории не отвечает '
+        '304 по сохранённой дате изменения.'
+    )
+
+
+@pytest.mark.django_db
+def test_last_modified_follows_category_rename(
+    unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    last_modified = unlogged_client.get(url)['Last-Modified']
+
+    later = timezone.now() + timedelta(hours=1)
+    with mock.patch('blog.cache.timezone.now', return_value=later):
+        post.category.title = 'Новое название'
+        post.category.save()
+    response = unlogged_client.get(
+        url, HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+    assert response.status_code == 200, (
+        'Убедитесь, что Last-Modified страницы поста меняется при '
+        'переименовании категории.'
+    )
+    assert 'Новое название' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_cached_pages_follow_author_rename(
+    unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    author = post.author
+    old_username = author.username
+    old_profile = f'/profile/{old_username}/'
+    urls = ('/', f'/posts/{post.id}/')
+    for url in (old_profile, *urls):
+        assert unlogged_client.get(url).status_code == 200
+
+    author.username = f'{old_username}-renamed'
+    author.save()
+    assert unlogged_client.get(old_profile).status_code == 404, (
+        'Убедитесь, что профиль по прежнему имени не отдаётся из кэша.'
+    )
+    for url in urls:
+        assert author.username in unlogged_client.get(
+            url
+        ).content.decode(), (
+            f'Убедитесь, что страница `{url}` сбрасывается при смене '
+            'имени автора.'
+        )
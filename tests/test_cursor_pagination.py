@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+
+def _page_ids(response):
+    return [post.id for post in response.context['page_obj']]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url_name', ('index', 'profile', 'category')
+)
+def test_cursor_pagination(
+    user_client, many_posts_with_published_locations, url_name
+):
+    posts = many_posts_with_published_locations
+    url = {
+        'index': '/',
+        'profile': f'/profile/{posts[0].author.username}/',
+        'category': f'/category/{posts[0].category.slug}/',
+    }[url_name]
+    expected = [
+        post.id for post in sorted(
+            posts, key=lambda post: (post.pub_date, post.id), reverse=True
+        )
+    ]
+
+    first = user_client.get(url, {'cursor': ''})
+    assert _page_ids(first) == expected[:N_PER_PAGE], (
+        'Убедитесь, что первая страница keyset-пагинации содержит самые '
+        'новые публикации.'
+    )
+    page_obj = first.context['page_obj']
+    assert not page_obj.has_previous()
+    assert page_obj.has_next()
+
+    second = user_client.get(url, {'cursor': page_obj.next_cursor})
+    assert _page_ids(second) == expected[N_PER_PAGE:2 * N_PER_PAGE], (
+        'Убедитесь, что токен next_cursor ведёт на следующую страницу.'
+    )
+    page_obj = second.context['page_obj']
+    assert not page_obj.has_next()
+
+    back = user_client.get(url, {'cursor': page_obj.previous_cursor})
+    assert _page_ids(back) == expected[:N_PER_PAGE], (
+        'Убедитесь, что токен previous_cursor ведёт на предыдущую страницу.'
+    )
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_falls_back_to_first_page(
+    user_client, many_posts_with_published_locations
+):
+    response = user_client.get('/', {'cursor': 'not-a-cursor'})
+    assert response.status_code == 200
+    assert len(response.context['page_obj']) == N_PER_PAGE
+
+
+@pytest.mark.django_db
+def test_feed_count_is_cached_until_posts_change(
+    mixer, user_client, many_posts_with_published_locations
+):
+    user_client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get('/')
+    assert response.context['paginator'].count == N_PER_PAGE * 2
+    assert not any(
+        'COUNT(' in query['sql'] for query in queries.captured_queries
+    ), 'Убедитесь, что число публикаций в ленте берётся из кэша.'
+
+    post = many_posts_with_published_locations[0]
+    mixer.blend(
+        'blog.Post', author=post.author, category=post.category,
+        location=post.location,
+    )
+    response = user_client.get('/')
+    assert response.context['paginator'].count == N_PER_PAGE * 2 + 1, (
+        'Убедитесь, что закэшированное число публикаций сбрасывается при '
+        'создании поста.'
+    )
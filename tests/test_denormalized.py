@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Comments, Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comment_writes(
+    mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f'/posts/{post.id}/comment/', {'text': 'Первый'})
+    mixer.cycle(2).blend(Comments, post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        'Убедитесь, что счётчик комментариев поста увеличивается при '
+        'добавлении комментария.'
+    )
+
+    Comments.objects.filter(post=post).first().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что счётчик комментариев поста уменьшается при '
+        'удалении комментария.'
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_repairs_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend(Comments, post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    call_command('recount_comments')
+
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+
+@pytest.mark.django_db
+def test_post_excerpt_is_stored_on_save(mixer, user):
+    post = mixer.blend(
+        Post, author=user, text=' '.join(f'слово{i}' for i in range(50))
+    )
+    assert post.excerpt == ' '.join(f'слово{i}' for i in range(10)) + ' …'
+
+    Post.objects.filter(pk=post.pk).update(excerpt='')
+    call_command('fill_excerpts')
+    post.refresh_from_db()
+    assert post.excerpt.startswith('слово0 ')
+
+
+@pytest.mark.django_db
+def test_publish_scheduled_brings_due_posts_to_feeds(
+    unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.pub_date = timezone.now() + timedelta(days=1)
+    post.save()
+    assert not post.is_live
+    assert post.title not in unlogged_client.get('/').content.decode()
+
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    call_command('publish_scheduled')
+
+    post.refresh_from_db()
+    assert post.is_live
+    assert post.title in unlogged_client.get('/').content.decode(), (
+        'Убедитесь, что команда publish_scheduled публикует отложенные '
+        'посты и сбрасывает кэш лент.'
+    )
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+
+DB_JSON = Path(__file__).resolve().parent.parent / 'db.json'
+
+
+@pytest.mark.django_db
+def test_db_json_fixture_loads():
+    call_command('loaddata', DB_JSON, verbosity=0)
+    assert Post.objects.count() == 39, (
+        'Убедитесь, что фикстура db.json из README загружается.'
+    )
+    assert not Post.objects.filter(updated_at__isnull=True).exists()
+    assert Post.objects.filter(Post.objects.published_q()).exists(), (
+        'Убедитесь, что посты из фикстуры видны в ленте после загрузки.'
+    )
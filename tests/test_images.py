@@ -0,0 +1,132 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import RENDITION_WIDTHS
+from blog.models import ImageRendition, MediaBlob, Post
+
+
+def make_upload(size=(2000, 1500), name='photo.png'):
+    output = BytesIO()
+    Image.new('RGB', size, 'teal').save(output, 'PNG')
+    return SimpleUploadedFile(name, output.getvalue(), 'image/png')
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_post_image_renditions_are_made_on_upload(
+    media_root, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.image = make_upload()
+    post.save()
+    assert not post.renditions.exists(), (
+        'Убедитесь, что копии изображения создаются в фоновой задаче, а '
+        'не при сохранении поста.'
+    )
+    assert f'src="{post.image.url}"' in user_client.get('/').content.decode()
+
+    call_command('run_tasks', '--once')
+    renditions = post.renditions.all()
+    assert {rendition.width for rendition in renditions} == set(
+        RENDITION_WIDTHS
+    ), (
+        'Убедитесь, что при загрузке изображения поста создаются его '
+        'уменьшенные копии.'
+    )
+    assert {ImageRendition.JPEG, ImageRendition.WEBP} <= {
+        rendition.format for rendition in renditions
+    }
+    for rendition in renditions:
+        with Image.open(media_root / rendition.name) as image:
+            assert image.width == rendition.width
+
+    for url in ('/', f'/posts/{post.id}/'):
+        content = user_client.get(url).content.decode()
+        assert 'srcset=' in content and 'type="image/webp"' in content, (
+            f'Убедитесь, что страница `{url}` предлагает браузеру копии '
+            'изображения разной ширины и формата.'
+        )
+        assert f'src="{post.image.url}"' not in content
+
+
+@pytest.mark.django_db
+def test_same_image_is_stored_once_and_collected_with_last_post(
+    mixer, media_root, user, post_with_published_location,
+    django_capture_on_commit_callbacks,
+):
+    first = post_with_published_location
+    first.image = make_upload(size=(500, 400))
+    first.save()
+    call_command('run_tasks', '--once')
+    second = mixer.blend(Post, author=user, image=make_upload(size=(500, 400)))
+
+    assert second.image.name == first.image.name, (
+        'Убедитесь, что одинаковые изображения хранятся одним файлом.'
+    )
+    assert MediaBlob.objects.get(name=first.image.name).ref_count == 2
+    assert {rendition.width for rendition in second.renditions.all()} == {
+        320, 500
+    }, 'Убедитесь, что копии одинаковых изображений не создаются заново.'
+    names = [first.image.name] + [
+        rendition.name for rendition in first.renditions.all()
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert all((media_root / name).exists() for name in names), (
+        'Убедитесь, что файл, на который ссылаются другие посты, не '
+        'удаляется.'
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    assert not any((media_root / name).exists() for name in names), (
+        'Убедитесь, что файл без ссылок удаляется вместе с копиями.'
+    )
+    assert not MediaBlob.objects.filter(name=names[0]).exists()
+
+
+@pytest.mark.django_db
+def test_broken_image_falls_back_to_original(
+    media_root, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.image = SimpleUploadedFile('broken.jpg', b'not an image')
+    post.save()
+    call_command('run_tasks', '--once')
+
+    assert not post.renditions.exists()
+    assert post.image.url in user_client.get('/').content.decode()
+
+
+@pytest.mark.django_db
+def test_post_form_rejects_oversized_images(settings, media_root, user_client):
+    settings.POST_IMAGE_MAX_PIXELS = 1000 * 1000
+    response = user_client.post('/posts/create/', {
+        'title': 'Заголовок',
+        'text': 'Текст',
+        'pub_date': '2020-01-01 00:00',
+        'image': make_upload(size=(2000, 1500)),
+    })
+    assert 'мегапикселей' in response.content.decode(), (
+        'Убедитесь, что форма поста отклоняет изображения с числом '
+        'пикселей больше POST_IMAGE_MAX_PIXELS.'
+    )
+
+    settings.POST_IMAGE_MAX_BYTES = 10
+    response = user_client.post('/posts/create/', {
+        'title': 'Заголовок',
+        'text': 'Текст',
+        'pub_date': '2020-01-01 00:00',
+        'image': make_upload(size=(20, 20)),
+    })
+    assert 'Файл слишком большой' in response.content.decode()
@@ -0,0 +1,16 @@
+from django.core.paginator import Paginator
+
+from blog.views import get_page_range
+
+from conftest import N_PER_PAGE
+
+
+def test_page_range_is_elided():
+    paginator = Paginator(range(200_000), N_PER_PAGE)
+    page_range = get_page_range(paginator.get_page(500))
+    ellipsis = paginator.ELLIPSIS
+    assert page_range == [
+        1, ellipsis, 498, 499, 500, 501, 502, ellipsis, 20_000
+    ], (
+        'Убедитесь, что в контекст передаётся сокращённый диапазон страниц.'
+    )
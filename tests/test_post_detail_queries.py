@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comments
+from blog.views import COMMENTS_ON_PAGE
+
+N_COMMENTS = 300
+
+
+def _count_detail_queries(client, post):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_post_detail_query_count_does_not_grow_with_comments(
+    mixer, user, another_user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend(Comments, post=post, author=user)
+    baseline = _count_detail_queries(user_client, post)
+
+    mixer.cycle(N_COMMENTS).blend(
+        Comments, post=post, author=mixer.sequence(user, another_user)
+    )
+    assert _count_detail_queries(user_client, post) == baseline, (
+        'Убедитесь, что авторы комментариев на странице поста загружаются '
+        'одним запросом вместе с комментариями.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_comments_are_paginated(
+    mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(COMMENTS_ON_PAGE * 2 + 5).blend(Comments, post=post)
+    expected = list(
+        Comments.objects.filter(post=post)
+        .order_by('created_at', 'pk')
+        .values_list('pk', flat=True)
+    )
+
+    response = user_client.get(f'/posts/{post.id}/')
+    comments = response.context['comments']
+    assert [comment.pk for comment in comments] == (
+        expected[:COMMENTS_ON_PAGE]
+    ), (
+        'Убедитесь, что на странице поста выводится первая страница '
+        'комментариев.'
+    )
+
+    loaded = []
+    while comments.has_next():
+        response = user_client.get(
+            f'/posts/{post.id}/comments/', {'cursor': comments.next_cursor}
+        )
+        assert response.status_code == 200
+        comments = response.context['comments']
+        loaded.extend(comment.pk for comment in comments)
+    assert loaded == expected[COMMENTS_ON_PAGE:], (
+        'Убедитесь, что остальные комментарии подгружаются по ссылке '
+        '«Показать ещё».'
+    )
+
+
+@pytest.mark.django_db
+def test_post_comments_fragment_hides_unpublished_post(
+    another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_post_detail_loads_post_with_relations_in_one_query(
+    another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        another_user_client.get(f'/posts/{post.id}/')
+    post_queries = [
+        query['sql'] for query in queries.captured_queries
+        if 'FROM "blog_post"' in query['sql']
+        or 'FROM "blog_category"' in query['sql']
+        or 'FROM "blog_location"' in query['sql']
+    ]
+    assert len(post_queries) == 1, (
+        'Убедитесь, что пост, его автор, категория и местоположение '
+        'загружаются на странице поста одним запросом.'
+    )
@@ -0,0 +1,66 @@
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blog.cache import cache_anonymous_page
+from blog.models import Post
+from blogicum.routers import (
+    STICKY_COOKIE,
+    PrimaryStickinessMiddleware,
+    ReplicaRouter,
+)
+
+
+def _read_db_in_request(request):
+    chosen = {}
+
+    def view(request):
+        chosen['db'] = ReplicaRouter().db_for_read(Post)
+        return HttpResponse()
+
+    response = PrimaryStickinessMiddleware(view)(request)
+    return chosen['db'], response
+
+
+def test_reads_use_primary_without_replicas():
+    assert ReplicaRouter().db_for_read(Post) == 'default'
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+def test_reads_go_to_replica_and_stick_to_primary_after_write():
+    factory = RequestFactory()
+
+    db, _ = _read_db_in_request(factory.get('/'))
+    assert db == 'replica1', (
+        'Убедитесь, что чтение в GET-запросах уходит на реплику.'
+    )
+
+    db, response = _read_db_in_request(factory.post('/posts/create/'))
+    assert db == 'default'
+    assert STICKY_COOKIE in response.cookies
+
+    request = factory.get('/')
+    request.COOKIES[STICKY_COOKIE] = response.cookies[STICKY_COOKIE].value
+    db, _ = _read_db_in_request(request)
+    assert db == 'default', (
+        'Убедитесь, что сразу после изменений автор читает из основной БД.'
+    )
+    assert ReplicaRouter().db_for_write(Post) == 'default'
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+def test_anonymous_page_cache_is_filled_from_primary():
+    chosen = {}
+
+    @cache_anonymous_page('posts')
+    def view(request):
+        chosen['db'] = ReplicaRouter().db_for_read(Post)
+        return HttpResponse()
+
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    PrimaryStickinessMiddleware(view)(request)
+    assert chosen['db'] == 'default', (
+        'Убедитесь, что страница для кэша анонимных посетителей читается '
+        'с основной БД, а не с отстающей реплики.'
+    )
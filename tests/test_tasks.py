@@ -0,0 +1,41 @@
+import pytest
+
+from blog.models import Task
+from blog.tasks import TASKS, enqueue, run_pending
+
+
+@pytest.mark.django_db
+def test_failed_task_is_retried_later(monkeypatch):
+    calls = []
+
+    def flaky(value):
+        calls.append(value)
+        if len(calls) == 1:
+            raise RuntimeError('временная ошибка')
+
+    monkeypatch.setitem(TASKS, 'flaky', flaky)
+    enqueue('flaky', 42)
+
+    assert run_pending() == (0, 1)
+    task = Task.objects.get()
+    assert 'временная ошибка' in task.last_error
+    assert task.run_after > task.created_at
+    assert run_pending() == (0, 0), (
+        'Убедитесь, что упавшая задача повторяется не сразу, а с задержкой.'
+    )
+
+    Task.objects.update(run_after=task.created_at)
+    assert run_pending() == (1, 0)
+    assert calls == [42, 42]
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+def test_enqueue_skips_duplicate_pending_task(monkeypatch):
+    monkeypatch.setitem(TASKS, 'noop', lambda value: None)
+    first = enqueue('noop', 1)
+    assert enqueue('noop', 1) == first, (
+        'Убедитесь, что такая же ожидающая задача не ставится повторно.'
+    )
+    enqueue('noop', 2)
+    assert Task.objects.count() == 2